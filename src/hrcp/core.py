@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import itertools
 from collections.abc import Iterator
 from typing import Any
 
+from hrcp.index import TreeIndex
 from hrcp.propagation import PropagationMode
 from hrcp.provenance import get_value
 from hrcp.serialization import load_children
@@ -13,7 +15,106 @@ from hrcp.serialization import tree_from_dict
 from hrcp.serialization import tree_from_json
 from hrcp.serialization import tree_to_dict
 from hrcp.serialization import tree_to_json
-from hrcp.wildcards import match_pattern
+from hrcp.wildcards import _compile_matcher
+
+# Generations are drawn from one global counter, so each value is only
+# ever held by one clock and a generation recorded from another clock can
+# never match by accident.
+_ticks = itertools.count()
+
+
+class _Clock:
+    """Change counters shared by every Resource in one tree.
+
+    Attributes:
+        generation: Replaced on every attribute write or structure change.
+        structure_generation: Replaced only when Resources are added or
+            removed; attribute changes leave anything that depends only on
+            tree shape valid.
+    """
+
+    __slots__ = ("generation", "structure_generation")
+
+    def __init__(self) -> None:
+        """Start a clock with a generation no other clock has."""
+        self.generation = self.structure_generation = next(_ticks)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # A copied tree gets a fresh clock, so generations stay unique
+        return (_Clock, ())
+
+    def touch(self) -> None:
+        """Record an attribute change."""
+        self.generation = next(_ticks)
+
+    def touch_structure(self) -> None:
+        """Record a Resource being added or removed."""
+        self.generation = self.structure_generation = next(_ticks)
+
+
+# Shared by every Resource outside a ResourceTree, so building Resources
+# costs no clock each; a ResourceTree gives its root a clock of its own.
+_DETACHED_CLOCK = _Clock()
+
+# Rebuilding a stale query index walks the whole tree, which only pays off
+# when a query has at least this many matches to resolve from it
+_INDEX_MIN_MATCHES = 32
+
+
+class _Attributes(dict[str, Any]):
+    """Attribute dict that records every mutation.
+
+    Reads are plain dict reads; writes advance the owning tree's clock so
+    that anything derived from the tree can tell it has changed.
+    """
+
+    __slots__ = ("_owner",)
+
+    def __init__(self, owner: Resource, data: Any = ()) -> None:
+        super().__init__(data)
+        self._owner = owner
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Copies and pickles must rebuild the owner link before any item is
+        # set, which the default dict protocol does not guarantee
+        return (_Attributes, (self._owner, dict(self)))
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._owner._clock.touch()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        self._owner._clock.touch()
+        super().__delitem__(key)
+
+    # dict.__or__ is overloaded in typeshed; restating it untyped lets mypy
+    # accept the mutating __ior__ below as its in-place form
+    def __or__(self, other: Any) -> Any:
+        return super().__or__(other)
+
+    def __ior__(self, other: Any) -> Any:
+        self._owner._clock.touch()
+        return super().__ior__(other)
+
+    def clear(self) -> None:
+        self._owner._clock.touch()
+        super().clear()
+
+    def pop(self, *args: Any) -> Any:
+        self._owner._clock.touch()
+        return super().pop(*args)
+
+    def popitem(self) -> tuple[str, Any]:
+        self._owner._clock.touch()
+        return super().popitem()
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        self._owner._clock.touch()
+        return super().setdefault(key, default)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        self._owner._clock.touch()
+        super().update(*args, **kwargs)
 
 
 class Resource:
@@ -33,6 +134,18 @@ class Resource:
         '/region/us-east-1'
     """
 
+    # Resources are built in bulk by from_dict() and create(); slots keep
+    # each one small and make attribute access a fixed offset lookup.
+    __slots__ = (
+        "__weakref__",
+        "_attributes",
+        "_children",
+        "_clock",
+        "_name",
+        "_parent",
+        "_path",
+    )
+
     def __init__(
         self,
         name: str,
@@ -58,7 +171,10 @@ class Resource:
         self._name = name
         self._parent: Resource | None = None
         self._children: dict[str, Resource] = {}
-        self._attributes: dict[str, Any] = dict(attributes) if attributes else {}
+        self._attributes: dict[str, Any] = _Attributes(self, attributes or ())
+        self._path: str | None = None
+        # Replaced by the tree's clock once this Resource is added to one
+        self._clock = _DETACHED_CLOCK
 
     @property
     def name(self) -> str:
@@ -84,12 +200,39 @@ class Resource:
     def path(self) -> str:
         """The full path from root to this Resource.
 
+        The path is computed once and cached; it is invalidated for the
+        whole subtree whenever this Resource or an ancestor is re-parented.
+
         Returns:
             Path string like '/region/datacenter/host'.
         """
-        if self._parent is None:
-            return f"/{self._name}"
-        return f"{self._parent.path}/{self._name}"
+        if self._path is not None:
+            return self._path
+
+        # Walk up to the nearest cached ancestor (or the root), then fill
+        # in the cache on the way back down.
+        uncached: list[Resource] = []
+        current: Resource | None = self
+        while current is not None and current._path is None:
+            uncached.append(current)
+            current = current._parent
+        # The walk only stops short of the root at a cached, non-empty path
+        prefix: str = (current._path or "") if current is not None else ""
+        for resource in reversed(uncached):
+            prefix = resource._path = f"{prefix}/{resource._name}"
+        return prefix
+
+    def _invalidate_path(self) -> None:
+        """Clear the cached path of this Resource and its descendants."""
+        stack = [self]
+        while stack:
+            resource = stack.pop()
+            # An uncached node never has cached descendants, since computing
+            # a descendant's path caches every ancestor along the way.
+            if resource._path is None:
+                continue
+            resource._path = None
+            stack.extend(resource._children.values())
 
     def add_child(self, child: Resource) -> None:
         """Add a child Resource.
@@ -100,12 +243,27 @@ class Resource:
         Raises:
             ValueError: If a child with the same name already exists.
         """
-        if child.name in self._children:
-            msg = f"Child '{child.name}' already exists"
+        name = child._name
+        if name in self._children:
+            msg = f"Child '{name}' already exists"
             raise ValueError(msg)
 
-        self._children[child.name] = child
+        clock = self._clock
+        clock.touch_structure()
+        self._children[name] = child
         child._parent = self
+        if not child._children:
+            child._clock = clock
+        elif child._clock is not clock:
+            # Changes anywhere in the new subtree now count for this tree
+            stack = [child]
+            while stack:
+                resource = stack.pop()
+                resource._clock = clock
+                stack.extend(resource._children.values())
+        # A new Resource has never cached a path, so skip the subtree walk
+        if child._path is not None:
+            child._invalidate_path()
 
     def remove_child(self, name: str) -> Resource:
         """Remove and return a child Resource by name.
@@ -119,8 +277,12 @@ class Resource:
         Raises:
             KeyError: If no child with that name exists.
         """
+        self._clock.touch_structure()
+        # The removed subtree keeps sharing this tree's clock; its changes
+        # then only cause extra invalidation here, never missed invalidation
         child = self._children.pop(name)
         child._parent = None
+        child._invalidate_path()
         return child
 
     def get_child(self, name: str) -> Resource | None:
@@ -193,6 +355,30 @@ class ResourceTree:
             root_name: Name for the root Resource.
         """
         self._root = Resource(name=root_name)
+        self._root._clock = _Clock()
+        self._index: TreeIndex | None = None
+        # Resolved paths, valid for one structure generation of the tree
+        self._path_cache: dict[str, Resource] = {}
+        self._path_cache_generation = -1
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Get the state to pickle or copy, without derived lookups.
+
+        The index and path cache are tagged with clock generations, which
+        are only unique within one process, so they are rebuilt on demand.
+        """
+        state = self.__dict__.copy()
+        state["_index"] = None
+        state["_path_cache"] = {}
+        state["_path_cache_generation"] = -1
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restore a pickled or copied tree."""
+        self.__dict__.update(state)
+        self._index = None
+        self._path_cache = {}
+        self._path_cache_generation = -1
 
     @property
     def root(self) -> Resource:
@@ -212,6 +398,15 @@ class ResourceTree:
         if path == "/":
             return self._root
 
+        generation = self._root._clock.structure_generation
+        if self._path_cache_generation != generation:
+            self._path_cache.clear()
+            self._path_cache_generation = generation
+        else:
+            cached = self._path_cache.get(path)
+            if cached is not None:
+                return cached
+
         # Remove leading slash and split
         parts = path.lstrip("/").split("/")
 
@@ -222,11 +417,13 @@ class ResourceTree:
         # Traverse from root
         current = self._root
         for part in parts[1:]:
-            child = current.get_child(part)
+            child = current._children.get(part)
             if child is None:
                 return None
             current = child
 
+        # Only hits are cached, so probing arbitrary paths cannot grow it
+        self._path_cache[path] = current
         return current
 
     def create(
@@ -256,26 +453,24 @@ class ResourceTree:
             msg = f"Path must start with '/{self._root.name}'"
             raise ValueError(msg)
 
-        # Check if target already exists
-        if self.get(path) is not None:
+        # Walk the part of the path that already exists, once
+        current = self._root
+        depth = 1
+        while depth < len(parts) and parts[depth] in current._children:
+            current = current._children[parts[depth]]
+            depth += 1
+        if depth == len(parts):
             msg = f"Resource already exists at '{path}'"
             raise ValueError(msg)
 
-        # Traverse/create path
-        current = self._root
-        for i, part in enumerate(parts[1:], start=1):
-            child = current.get_child(part)
-            if child is None:
-                # Create intermediate or final resource
-                is_final = i == len(parts) - 1
-                child = Resource(
-                    name=part,
-                    attributes=attributes if is_final else None,
-                )
-                current.add_child(child)
+        # Create the rest; only the final Resource gets the attributes
+        for part in parts[depth:-1]:
+            child = Resource(name=part)
+            current.add_child(child)
             current = child
-
-        return current
+        child = Resource(name=parts[-1], attributes=attributes)
+        current.add_child(child)
+        return child
 
     def delete(self, path: str) -> Resource:
         """Delete a Resource and its subtree.
@@ -314,6 +509,9 @@ class ResourceTree:
     def walk(self, start_path: str = "/") -> Iterator[Resource]:
         """Iterate over all Resources in the tree (depth-first).
 
+        Each Resource's children are read when that Resource is yielded, so
+        changes below a Resource not yet reached are seen by the walk.
+
         Args:
             start_path: Path to start walking from (default: root).
 
@@ -335,14 +533,26 @@ class ResourceTree:
         yield from self._walk_resource(start)
 
     def _walk_resource(self, resource: Resource) -> Iterator[Resource]:
-        """Recursively walk a Resource and its children."""
-        yield resource
-        for child in resource.children.values():
-            yield from self._walk_resource(child)
+        """Walk a Resource and its descendants in depth-first pre-order."""
+        # One explicit stack instead of a nested generator per level, so
+        # deep trees neither pay per-level resumption nor hit the
+        # recursion limit
+        stack = [resource]
+        while stack:
+            current = stack.pop()
+            yield current
+            stack.extend(reversed(current._children.values()))
 
     def __len__(self) -> int:
         """Return the total number of Resources in the tree."""
-        return sum(1 for _ in self.walk())
+        # Count on the walk stack directly rather than resuming a
+        # generator once per Resource
+        count = 0
+        stack = [self._root]
+        while stack:
+            count += 1
+            stack.extend(stack.pop()._children.values())
+        return count
 
     def query(self, pattern: str) -> list[Resource]:
         """Query resources matching a wildcard pattern.
@@ -357,11 +567,44 @@ class ResourceTree:
         Returns:
             List of matching Resources.
         """
-        return [
-            resource
-            for resource in self.walk()
-            if match_pattern(resource.path, pattern)
-        ]
+        segments = pattern.strip("/").split("/")
+
+        # Leading literal segments pin the one subtree any match lies in
+        literal = 0
+        while literal < len(segments) and "*" not in segments[literal]:
+            literal += 1
+        if "" in segments[:literal]:
+            return []  # Resource names are never empty
+        if literal:
+            start = self.get("/" + "/".join(segments[:literal]))
+            if start is None:
+                return []
+            if literal == len(segments):
+                return [start]
+        else:
+            start = self._root
+
+        matches = _compile_matcher(pattern)
+        if "**" in segments:
+            # Any depth may match: filter the whole subtree in one pass
+            # over the shared explicit-stack walk
+            return [r for r in self._walk_resource(start) if matches(r.path)]
+
+        # Without "**", a match sits exactly len(segments) levels deep, so
+        # nothing below that depth needs visiting
+        max_depth = len(segments)
+        results: list[Resource] = []
+        stack = [(start, literal or 1)]
+        while stack:
+            resource, depth = stack.pop()
+            if depth == max_depth:
+                if matches(resource.path):
+                    results.append(resource)
+                continue
+            stack.extend(
+                (child, depth + 1) for child in reversed(resource._children.values())
+            )
+        return results
 
     def query_values(
         self,
@@ -380,16 +623,51 @@ class ResourceTree:
             List of values from matching resources (excludes None values).
         """
         results: list[Any] = []
-        for resource in self.query(pattern):
-            value = get_value(resource, key, mode)
-            if mode == PropagationMode.UP:
-                # UP returns a list, extend if not empty
-                if value and isinstance(value, list):
-                    results.extend(value)
-            elif value is not None:
-                results.append(value)
+        matches = self.query(pattern)
+        index = None
+        if mode in {PropagationMode.UP, PropagationMode.INHERIT}:
+            index = self._get_index(len(matches))
+
+        if index is None:
+            for resource in matches:
+                value = get_value(resource, key, mode)
+                if mode == PropagationMode.UP:
+                    # UP returns a list, extend if not empty
+                    if value and isinstance(value, list):
+                        results.extend(value)
+                elif value is not None:
+                    results.append(value)
+        elif mode == PropagationMode.UP:
+            # Aggregate every match from one pre-order column instead of
+            # walking each matched subtree separately
+            for resource in matches:
+                results.extend(index.aggregate(resource, key))
+        else:
+            for resource in matches:
+                value = index.inherit(resource, key)
+                if value is not None:
+                    results.append(value)
         return results
 
+    def _get_index(self, matches: int) -> TreeIndex | None:
+        """Get the pre-order index if it is worth using for a query.
+
+        Args:
+            matches: Number of Resources the query has to resolve.
+
+        Returns:
+            The index if it is current, or rebuilt for enough matches;
+            otherwise None, and the matches are best resolved one by one.
+        """
+        index = self._index
+        generation = self._root._clock.generation
+        if index is not None and index.generation == generation:
+            return index
+        if matches < _INDEX_MIN_MATCHES:
+            return None
+        index = self._index = TreeIndex(self._root, generation)
+        return index
+
     def to_dict(self) -> dict[str, Any]:
         """Serialize the tree to a dictionary.
 
@@ -399,20 +677,22 @@ class ResourceTree:
         return tree_to_dict(self)
 
     def _resource_to_dict(self, resource: Resource) -> dict[str, Any]:
-        """Recursively serialize a Resource to a dict."""
+        """Serialize a Resource and its subtree to a dict."""
         return resource_to_dict(resource)
 
     @classmethod
-    def from_dict(cls, data: dict[str, Any]) -> ResourceTree:
+    def from_dict(cls, data: dict[str, Any], *, validate: bool = True) -> ResourceTree:
         """Create a ResourceTree from a dictionary.
 
         Args:
             data: A dict representation of the tree.
+            validate: If False, skip type checks on the data. Only use this
+                      for trusted data, e.g. the output of to_dict().
 
         Returns:
             A new ResourceTree with the data.
         """
-        return tree_from_dict(data)
+        return tree_from_dict(data, validate=validate)
 
     @classmethod
     def _load_children(
@@ -421,7 +701,7 @@ class ResourceTree:
         parent: Resource,
         children_data: dict[str, dict[str, Any]],
     ) -> None:
-        """Recursively load children from dict data."""
+        """Load children, and their descendants, from dict data."""
         load_children(tree, parent, children_data)
 
     def to_json(self, path: str, indent: int = 2) -> None:
@@ -434,16 +714,18 @@ class ResourceTree:
         tree_to_json(self, path, indent)
 
     @classmethod
-    def from_json(cls, path: str) -> ResourceTree:
+    def from_json(cls, path: str, *, validate: bool = True) -> ResourceTree:
         """Load a ResourceTree from a JSON file.
 
         Args:
             path: Path to the JSON file.
+            validate: If False, skip type checks on the loaded data. Only use
+                      this for files written by to_json().
 
         Returns:
             A new ResourceTree loaded from the file.
         """
-        return tree_from_json(path)
+        return tree_from_json(path, validate=validate)
 
     def __repr__(self) -> str:
         """Return a string representation of the ResourceTree."""
@@ -0,0 +1,127 @@
+"""Pre-order index for bulk lookups over an HRCP tree.
+
+Numbers every Resource in depth-first pre-order, so that each subtree
+occupies a contiguous range of positions, and keeps per-key attribute
+columns in that same order. Aggregating a subtree then becomes a slice of
+one column instead of a walk over every descendant.
+
+Because a parent always precedes its children in pre-order, a per-position
+array of inherited values is filled in a single forward pass, turning
+INHERIT into an array read instead of a walk up the parent chain.
+
+REQUIRE_PATH is deliberately not indexed: it depends on whether stored
+values are truthy, and a value emptied in place (a list cleared by the
+caller, say) does not change the tree generation.
+
+An index is a snapshot: it records the tree generation it was built at
+and must be rebuilt once the tree changes.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import TYPE_CHECKING
+from typing import Any
+
+if TYPE_CHECKING:
+    from hrcp.core import Resource
+
+
+class TreeIndex:
+    """Pre-order numbering of a tree with lazily built attribute columns.
+
+    Attributes:
+        generation: The tree clock generation the index was built at.
+    """
+
+    def __init__(self, root: Resource, generation: int) -> None:
+        """Index the tree rooted at root.
+
+        Args:
+            root: The root Resource to index.
+            generation: The current generation of the tree's clock.
+        """
+        order: list[Resource] = []
+        parents: list[int] = []
+        stack: list[tuple[Resource, int]] = [(root, -1)]
+        while stack:
+            resource, parent_pos = stack.pop()
+            pos = len(order)
+            order.append(resource)
+            parents.append(parent_pos)
+            stack.extend((child, pos) for child in reversed(resource.children.values()))
+
+        # Subtree sizes, accumulated bottom-up: a child always follows its
+        # parent in pre-order, so walking backwards visits children first.
+        sizes = [1] * len(order)
+        for pos in range(len(order) - 1, 0, -1):
+            sizes[parents[pos]] += sizes[pos]
+
+        self.generation = generation
+        self._order = order
+        self._parents = parents
+        self._sizes = sizes
+        self._positions = {resource: pos for pos, resource in enumerate(order)}
+        self._columns: dict[str, tuple[list[int], list[Any]]] = {}
+        self._inherited: dict[str, list[Any]] = {}
+
+    def _column(self, key: str) -> tuple[list[int], list[Any]]:
+        """Get the (positions, values) column for key, building it once."""
+        column = self._columns.get(key)
+        if column is None:
+            positions: list[int] = []
+            values: list[Any] = []
+            for pos, resource in enumerate(self._order):
+                value = resource.attributes.get(key)
+                if value is not None:
+                    positions.append(pos)
+                    values.append(value)
+            column = self._columns[key] = (positions, values)
+        return column
+
+    def _subtree_slice(self, resource: Resource, key: str) -> tuple[int, int]:
+        """Get the column slice bounds covering resource's subtree."""
+        enter = self._positions[resource]
+        positions, _ = self._column(key)
+        lo = bisect_left(positions, enter)
+        hi = bisect_left(positions, enter + self._sizes[enter], lo)
+        return lo, hi
+
+    def aggregate(self, resource: Resource, key: str) -> list[Any]:
+        """Collect key's values from resource's subtree in pre-order.
+
+        Equivalent to AGGREGATE propagation for a Resource in this tree.
+
+        Args:
+            resource: A Resource in the indexed tree.
+            key: The attribute key.
+
+        Returns:
+            List of non-None values found in the subtree.
+        """
+        lo, hi = self._subtree_slice(resource, key)
+        return self._columns[key][1][lo:hi]
+
+    def inherit(self, resource: Resource, key: str) -> Any:
+        """Get key's value from resource or its closest ancestor that has it.
+
+        Equivalent to INHERIT propagation for a Resource in this tree.
+
+        Args:
+            resource: A Resource in the indexed tree.
+            key: The attribute key.
+
+        Returns:
+            The inherited value, or None if no ancestor has one.
+        """
+        inherited = self._inherited.get(key)
+        if inherited is None:
+            parents = self._parents
+            inherited = [None] * len(self._order)
+            for pos, current in enumerate(self._order):
+                value = current.attributes.get(key)
+                if value is None and pos:
+                    value = inherited[parents[pos]]
+                inherited[pos] = value
+            self._inherited[key] = inherited
+        return inherited[self._positions[resource]]
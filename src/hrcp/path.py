@@ -12,6 +12,12 @@ def join_path(*segments: str) -> str:
     Returns:
         A normalized path with segments joined by /.
     """
+    # Fast path: a single plain segment needs no splitting or rejoining
+    if len(segments) == 1:
+        clean = segments[0].strip("/")
+        if "/" not in clean:
+            return "/" + clean
+
     parts = []
     for segment in segments:
         # Strip leading/trailing slashes and split
@@ -31,11 +37,9 @@ def split_path(path: str) -> list[str]:
     Returns:
         List of path segments (without leading slash).
     """
-    clean = path.strip("/")
-    if not clean:
-        return []
-    # Filter out empty segments from double slashes
-    return [s for s in clean.split("/") if s]
+    # Filtering drops the empty segments left by leading, trailing and
+    # double slashes, so no separate strip pass is needed
+    return list(filter(None, path.split("/")))
 
 
 def parent_path(path: str) -> str:
@@ -79,6 +83,10 @@ def normalize_path(path: str) -> str:
     Returns:
         Normalized path.
     """
+    # Fast path: already canonical paths are returned unchanged
+    if path[:1] == "/" and path[-1:] != "/" and "//" not in path:
+        return path
+
     # Split and rejoin to handle all cases
     segments = split_path(path)
     if not segments:
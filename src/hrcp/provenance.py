@@ -9,6 +9,7 @@ Provenance provides transparency into configuration resolution by tracking:
 
 from __future__ import annotations
 
+from collections.abc import Callable
 from dataclasses import dataclass
 from dataclasses import field
 from typing import TYPE_CHECKING
@@ -20,7 +21,12 @@ if TYPE_CHECKING:
     from hrcp.core import Resource
 
 
-@dataclass
+# Sentinel for "no value found" in the value-only resolvers, where None
+# could be mistaken for a resolved value.
+_MISSING: Any = object()
+
+
+@dataclass(slots=True)
 class Provenance:
     """Records the origin and resolution path of a configuration value.
 
@@ -73,28 +79,105 @@ def get_value(
             its origin information, or None if value doesn't exist (except
             for AGGREGATE mode which returns Provenance with empty list).
     """
-    if mode == PropagationMode.NONE:
-        prov = _provenance_none(resource, key)
-    elif mode == PropagationMode.INHERIT:
-        prov = _provenance_inherit(resource, key)
-    elif mode == PropagationMode.AGGREGATE:
-        prov = _provenance_aggregate(resource, key)
-    elif mode == PropagationMode.MERGE:
-        prov = _provenance_merge(resource, key)
-    elif mode == PropagationMode.REQUIRE_PATH:
-        prov = _provenance_require_path(resource, key)
-    elif mode == PropagationMode.COLLECT_ANCESTORS:
-        prov = _provenance_collect_ancestors(resource, key)
-    else:
+    # Value-only lookups have their own resolvers, so plain reads never pay
+    # for Provenance construction or key-source tracking.
+    resolvers = _PROVENANCE_RESOLVERS if with_provenance else _VALUE_RESOLVERS
+    try:
+        resolve = resolvers[mode]
+    except KeyError:
         msg = f"Unknown propagation mode: {mode}"
-        raise ValueError(msg)
+        raise ValueError(msg) from None
+    result = resolve(resource, key)
+
+    if with_provenance or result is not _MISSING:
+        return result
+    return default
+
+
+def _value_none(resource: Resource, key: str) -> Any:
+    """Get the value for NONE mode - local value only."""
+    value = resource.attributes.get(key)
+    return _MISSING if value is None else value
+
+
+def _value_inherit(resource: Resource, key: str) -> Any:
+    """Get the value for INHERIT mode - closest ancestor wins."""
+    current: Resource | None = resource
+    while current is not None:
+        value = current.attributes.get(key)
+        if value is not None:
+            return value
+        current = current.parent
+    return _MISSING
+
 
-    if with_provenance:
-        return prov
+def _value_require_path(resource: Resource, key: str) -> Any:
+    """Get the value for REQUIRE_PATH mode - all ancestors must be truthy."""
+    if not _path_truthy(resource, key):
+        return _MISSING
+    return resource.attributes[key]
 
-    if prov is None:
-        return default
-    return prov.value
+
+def _path_truthy(resource: Resource, key: str) -> bool:
+    """Check that key is truthy on resource and every one of its ancestors."""
+    current: Resource | None = resource
+    while current is not None:
+        if not current.attributes.get(key):
+            return False
+        current = current.parent
+    return True
+
+
+def _value_collect_ancestors(resource: Resource, key: str) -> list[Any]:
+    """Get the values for COLLECT_ANCESTORS mode - from self to root."""
+    values: list[Any] = []
+    current: Resource | None = resource
+    while current is not None:
+        value = current.attributes.get(key)
+        if value is not None:
+            values.append(value)
+        current = current.parent
+    return values
+
+
+def _value_aggregate(resource: Resource, key: str) -> list[Any]:
+    """Get the values for AGGREGATE mode - from the whole subtree."""
+    values: list[Any] = []
+    _collect_values(resource, key, values)
+    return values
+
+
+def _collect_values(resource: Resource, key: str, values: list[Any]) -> None:
+    """Collect values from a subtree in depth-first pre-order."""
+    stack = [resource]
+    while stack:
+        current = stack.pop()
+        value = current.attributes.get(key)
+        if value is not None:
+            values.append(value)
+        stack.extend(reversed(current.children.values()))
+
+
+def _value_merge(resource: Resource, key: str) -> Any:
+    """Get the value for MERGE mode - deep merge without key tracking."""
+    chain: list[dict[str, Any]] = []
+    current: Resource | None = resource
+    while current is not None:
+        value = current.attributes.get(key)
+        if value is not None:
+            if not isinstance(value, dict):
+                # Any non-dict: use INHERIT behavior (closest value wins)
+                return chain[0] if chain else value
+            chain.append(value)
+        current = current.parent
+
+    if not chain:
+        return _MISSING
+
+    result: dict[str, Any] = {}
+    for d in reversed(chain):
+        _deep_merge(result, d)
+    return result
 
 
 def _provenance_none(resource: Resource, key: str) -> Provenance | None:
@@ -147,24 +230,18 @@ def _provenance_require_path(resource: Resource, key: str) -> Provenance | None:
     Returns the local value only if ALL nodes from self to root have the
     attribute set to a truthy value. Otherwise returns None.
     """
-    # First check if local value exists and is truthy
-    local_value = resource.attributes.get(key)
-    if not local_value:
+    if not _path_truthy(resource, key):
         return None
 
-    # Walk up to root, checking each ancestor
-    paths: list[str] = [resource.path]
-    current: Resource | None = resource.parent
+    # All ancestors have truthy values
+    paths: list[str] = []
+    current: Resource | None = resource
     while current is not None:
-        value = current.attributes.get(key)
-        if not value:
-            return None
         paths.append(current.path)
         current = current.parent
 
-    # All ancestors have truthy values
     return Provenance(
-        value=local_value,
+        value=resource.attributes[key],
         source_path=resource.path,
         mode=PropagationMode.REQUIRE_PATH,
         contributing_paths=list(reversed(paths)),  # Root to leaf order
@@ -202,50 +279,50 @@ def _collect_values_with_paths(
     values: list[Any],
     paths: list[str],
 ) -> None:
-    """Recursively collect values and their source paths."""
-    value = resource.attributes.get(key)
-    if value is not None:
-        values.append(value)
-        paths.append(resource.path)
-
-    for child in resource.children.values():
-        _collect_values_with_paths(child, key, values, paths)
+    """Collect values and their source paths in depth-first pre-order."""
+    stack = [resource]
+    while stack:
+        current = stack.pop()
+        value = current.attributes.get(key)
+        if value is not None:
+            values.append(value)
+            paths.append(current.path)
+        stack.extend(reversed(current.children.values()))
 
 
 def _provenance_merge(resource: Resource, key: str) -> Provenance | None:
     """Get provenance for MERGE mode - deep merge with key tracking."""
-    # Collect all values and their sources from root to leaf
-    chain: list[tuple[Any, str]] = []  # (value, path)
+    # Collect dict values and their sources from leaf to root, stopping at
+    # the first non-dict since that alone decides the result
+    chain: list[tuple[dict[str, Any], str]] = []  # (value, path)
     current: Resource | None = resource
     while current is not None:
         value = current.attributes.get(key)
         if value is not None:
+            if not isinstance(value, dict):
+                # Any non-dict: use INHERIT behavior (closest value wins)
+                if chain:
+                    return Provenance(
+                        value=chain[0][0],
+                        source_path=chain[0][1],
+                        mode=PropagationMode.MERGE,
+                    )
+                return Provenance(
+                    value=value,
+                    source_path=current.path,
+                    mode=PropagationMode.MERGE,
+                )
             chain.append((value, current.path))
         current = current.parent
 
     if not chain:
         return None
 
-    # Reverse to go from root to leaf
-    chain.reverse()
-
-    # Check if we're dealing with dicts
-    all_dicts = all(isinstance(v, dict) for v, _ in chain)
-
-    if not all_dicts:
-        # Non-dict: use INHERIT behavior (last value wins)
-        value, path = chain[-1]
-        return Provenance(
-            value=value,
-            source_path=path,
-            mode=PropagationMode.MERGE,
-        )
-
-    # Deep merge with key tracking
+    # Deep merge from root to leaf with key tracking
     result: dict[str, Any] = {}
     key_sources: dict[str, str] = {}
 
-    for d, path in chain:
+    for d, path in reversed(chain):
         _deep_merge_with_tracking(result, d, path, key_sources, prefix="")
 
     return Provenance(
@@ -263,7 +340,13 @@ def _deep_merge_with_tracking(
     key_sources: dict[str, str],
     prefix: str,
 ) -> None:
-    """Recursively merge override into base, tracking key sources.
+    """Merge override into base, tracking key sources.
+
+    Uses an explicit worklist of (base, override, prefix) triples rather
+    than recursion, so arbitrarily deep dicts merge without call overhead
+    or hitting the recursion limit. Nested dicts from override are merged
+    into fresh dicts, never assigned by reference, so resolving a value
+    never mutates a resource's attributes.
 
     Args:
         base: The base dict to merge into.
@@ -272,32 +355,81 @@ def _deep_merge_with_tracking(
         key_sources: Dict to record which path each key came from.
         prefix: Dot-notation prefix for nested keys.
     """
-    for k, v in override.items():
-        full_key = f"{prefix}.{k}" if prefix else k
-
-        if k in base and isinstance(base[k], dict) and isinstance(v, dict):
-            # Recursively merge nested dicts
-            _deep_merge_with_tracking(base[k], v, source_path, key_sources, full_key)
-        else:
-            # Override the value and record source
-            base[k] = v
+    # Each frame carries its dotted prefix already joined ("a.b."), so a
+    # leaf costs one concatenation regardless of depth and sibling leaves
+    # share the prefix string.
+    stack = [(base, override, f"{prefix}." if prefix else "")]
+    while stack:
+        b, o, dotted = stack.pop()
+        if not b:
+            # Fresh target (first layer or a replaced subtree): nothing to
+            # merge against, so copy in bulk and only revisit nested dicts.
+            b.update(o)
+            for k, v in o.items():
+                if isinstance(v, dict):
+                    fresh: dict[str, Any] = {}
+                    b[k] = fresh
+                    stack.append((fresh, v, f"{dotted}{k}."))
+                else:
+                    key_sources[f"{dotted}{k}" if dotted else k] = source_path
+            continue
+        for k, v in o.items():
             if isinstance(v, dict):
-                # Record all leaf keys in the nested dict
-                _record_all_leaf_keys(v, source_path, key_sources, full_key)
+                bv = b.get(k)
+                if not isinstance(bv, dict):
+                    # Replace (or create) with a fresh dict; every leaf of v
+                    # is then recorded as coming from source_path
+                    bv = b[k] = {}
+                stack.append((bv, v, f"{dotted}{k}."))
             else:
-                key_sources[full_key] = source_path
+                b[k] = v
+                key_sources[f"{dotted}{k}" if dotted else k] = source_path
 
 
-def _record_all_leaf_keys(
-    d: dict[str, Any],
-    source_path: str,
-    key_sources: dict[str, str],
-    prefix: str,
-) -> None:
-    """Record all leaf keys in a dict with their source path."""
-    for k, v in d.items():
-        full_key = f"{prefix}.{k}" if prefix else k
-        if isinstance(v, dict):
-            _record_all_leaf_keys(v, source_path, key_sources, full_key)
-        else:
-            key_sources[full_key] = source_path
+def _deep_merge(base: dict[str, Any], override: dict[str, Any]) -> None:
+    """Merge override into base in place.
+
+    Like _deep_merge_with_tracking, but without recording key sources.
+    """
+    stack = [(base, override)]
+    while stack:
+        b, o = stack.pop()
+        if not b:
+            # Fresh target: copy in bulk and only revisit nested dicts
+            b.update(o)
+            for k, v in o.items():
+                if isinstance(v, dict):
+                    fresh: dict[str, Any] = {}
+                    b[k] = fresh
+                    stack.append((fresh, v))
+            continue
+        for k, v in o.items():
+            if isinstance(v, dict):
+                bv = b.get(k)
+                if not isinstance(bv, dict):
+                    bv = b[k] = {}
+                stack.append((bv, v))
+            else:
+                b[k] = v
+
+
+# Mode dispatch tables, one dict lookup per get_value() call
+_VALUE_RESOLVERS: dict[PropagationMode, Callable[[Resource, str], Any]] = {
+    PropagationMode.NONE: _value_none,
+    PropagationMode.INHERIT: _value_inherit,
+    PropagationMode.AGGREGATE: _value_aggregate,
+    PropagationMode.MERGE: _value_merge,
+    PropagationMode.REQUIRE_PATH: _value_require_path,
+    PropagationMode.COLLECT_ANCESTORS: _value_collect_ancestors,
+}
+
+_PROVENANCE_RESOLVERS: dict[
+    PropagationMode, Callable[[Resource, str], Provenance | None]
+] = {
+    PropagationMode.NONE: _provenance_none,
+    PropagationMode.INHERIT: _provenance_inherit,
+    PropagationMode.AGGREGATE: _provenance_aggregate,
+    PropagationMode.MERGE: _provenance_merge,
+    PropagationMode.REQUIRE_PATH: _provenance_require_path,
+    PropagationMode.COLLECT_ANCESTORS: _provenance_collect_ancestors,
+}
@@ -5,6 +5,8 @@ Provides conversion to/from dict and JSON formats.
 
 from __future__ import annotations
 
+import json
+from pathlib import Path
 from typing import TYPE_CHECKING
 from typing import Any
 
@@ -13,15 +15,47 @@ if TYPE_CHECKING:
     from hrcp.core import ResourceTree
 
 
-def resource_to_dict(resource: Resource) -> dict[str, Any]:
-    """Recursively serialize a Resource to a dict."""
-    return {
+def resource_to_dict(
+    resource: Resource,
+    *,
+    copy_attributes: bool = True,
+) -> dict[str, Any]:
+    """Serialize a Resource and its subtree to a dict.
+
+    Args:
+        resource: The Resource to serialize.
+        copy_attributes: If True, each "attributes" entry is a copy. If
+            False, it is the Resource's own attributes mapping, which is
+            only safe when the result is consumed immediately (e.g. dumped
+            to JSON) and never mutated.
+
+    Returns:
+        A dict with "name", "attributes" and nested "children" dicts.
+    """
+    result: dict[str, Any] = {
         "name": resource.name,
-        "attributes": dict(resource.attributes),
-        "children": {
-            name: resource_to_dict(child) for name, child in resource.children.items()
-        },
+        "attributes": (
+            dict(resource.attributes) if copy_attributes else resource.attributes
+        ),
+        "children": {},
     }
+    # Build top-down with an explicit stack: each child dict is inserted
+    # into its parent's "children" as soon as it is created, so child order
+    # is preserved and deep trees never hit the recursion limit.
+    stack = [(resource, result["children"])]
+    while stack:
+        current, children = stack.pop()
+        for name, child in current.children.items():
+            child_children: dict[str, Any] = {}
+            children[name] = {
+                "name": child.name,
+                "attributes": (
+                    dict(child.attributes) if copy_attributes else child.attributes
+                ),
+                "children": child_children,
+            }
+            stack.append((child, child_children))
+    return result
 
 
 def tree_to_dict(tree: ResourceTree) -> dict[str, Any]:
@@ -33,13 +67,17 @@ def load_children(
     tree: ResourceTree,
     parent: Resource,
     children_data: dict[str, dict[str, Any]],
+    *,
+    validate: bool = True,
 ) -> None:
-    """Recursively load children from dict data.
+    """Load children, and their descendants, from dict data.
 
     Args:
         tree: The ResourceTree being populated.
         parent: The parent Resource to add children to.
         children_data: Dictionary mapping child keys to child data dicts.
+        validate: If False, skip the type checks on child data. Only for
+                  trusted data, such as the output of tree_to_dict().
 
     Raises:
         TypeError: If child data is not a dict, or child attributes/children
@@ -47,42 +85,67 @@ def load_children(
         KeyError: If child is missing required 'name' key.
         ValueError: If child name is empty or contains '/'.
     """
+    # Imported here since hrcp.core imports this module; resolved once per
+    # load rather than once per Resource
     from hrcp.core import Resource
 
-    for key, child_data in children_data.items():
-        if not isinstance(child_data, dict):
-            msg = f"child data for '{key}' must be a dict, got {type(child_data).__name__}"
-            raise TypeError(msg)
-
-        name = child_data["name"]
-        if not isinstance(name, str):
-            msg = f"child name must be a string, got {type(name).__name__}"
-            raise TypeError(msg)
-
-        attributes = child_data.get("attributes")
-        if attributes is not None and not isinstance(attributes, dict):
-            msg = f"child attributes must be a dict, got {type(attributes).__name__}"
-            raise TypeError(msg)
-
-        nested_children = child_data.get("children", {})
-        if not isinstance(nested_children, dict):
-            msg = f"child children must be a dict, got {type(nested_children).__name__}"
-            raise TypeError(msg)
+    # A stack of (parent, pending children) iterators visits children in
+    # the same depth-first order as recursion would, so Resources are added
+    # and errors raised in the same order, without a frame per level
+    stack = [(parent, iter(children_data.items()))]
+    while stack:
+        current, pending = stack[-1]
+        item = next(pending, None)
+        if item is None:
+            stack.pop()
+            continue
+        key, child_data = item
+
+        if not validate:
+            name = child_data["name"]
+            attributes = child_data.get("attributes")
+            nested_children = child_data.get("children")
+        else:
+            if not isinstance(child_data, dict):
+                msg = f"child data for '{key}' must be a dict, got {type(child_data).__name__}"
+                raise TypeError(msg)
+
+            name = child_data["name"]
+            if not isinstance(name, str):
+                msg = f"child name must be a string, got {type(name).__name__}"
+                raise TypeError(msg)
+
+            attributes = child_data.get("attributes")
+            if attributes is not None and not isinstance(attributes, dict):
+                msg = (
+                    f"child attributes must be a dict, got {type(attributes).__name__}"
+                )
+                raise TypeError(msg)
+
+            nested_children = child_data.get("children", {})
+            if not isinstance(nested_children, dict):
+                msg = f"child children must be a dict, got {type(nested_children).__name__}"
+                raise TypeError(msg)
 
         child = Resource(
             name=name,
             attributes=attributes,
         )
-        parent.add_child(child)
-        load_children(tree, child, nested_children)
+        current.add_child(child)
+        if nested_children:
+            stack.append((child, iter(nested_children.items())))
 
 
-def tree_from_dict(data: dict[str, Any]) -> ResourceTree:
+def tree_from_dict(data: dict[str, Any], *, validate: bool = True) -> ResourceTree:
     """Create a ResourceTree from a dictionary.
 
     Args:
         data: Dictionary with 'name' (required), 'attributes' (optional dict),
               and 'children' (optional dict of child dicts).
+        validate: If False, skip the type checks on the data. Only for
+                  trusted data, such as the output of tree_to_dict(); malformed
+                  data then fails with unhelpful errors or loads incorrectly.
+                  Resource names are still checked.
 
     Returns:
         A new ResourceTree populated from the dictionary.
@@ -95,6 +158,12 @@ def tree_from_dict(data: dict[str, Any]) -> ResourceTree:
     """
     from hrcp.core import ResourceTree
 
+    if not validate:
+        tree = ResourceTree(root_name=data["name"])
+        tree._root._attributes.update(data.get("attributes") or {})
+        load_children(tree, tree._root, data.get("children") or {}, validate=False)
+        return tree
+
     name = data["name"]
     if not isinstance(name, str):
         msg = f"name must be a string, got {type(name).__name__}"
@@ -114,26 +183,25 @@ def tree_from_dict(data: dict[str, Any]) -> ResourceTree:
     # Set root attributes
     for key, value in attributes.items():
         tree._root._attributes[key] = value  # Bypass validation for load
-    # Recursively create children
+    # Create children and their descendants
     load_children(tree, tree._root, children)
     return tree
 
 
 def tree_to_json(tree: ResourceTree, path: str, indent: int = 2) -> None:
     """Save a tree to a JSON file."""
-    import json
-    from pathlib import Path
-
-    data = tree_to_dict(tree)
+    # Dumped straight away, so the attribute dicts need no defensive copy
+    data = resource_to_dict(tree.root, copy_attributes=False)
+    # Stream into the file rather than building the whole document as one
+    # string, which keeps peak memory flat for large trees. The stdlib
+    # encoder is kept over orjson and friends: hrcp has no runtime
+    # dependencies, and output must not depend on what else is installed.
     with Path(path).open("w") as f:
         json.dump(data, f, indent=indent)
 
 
-def tree_from_json(path: str) -> ResourceTree:
+def tree_from_json(path: str, *, validate: bool = True) -> ResourceTree:
     """Load a ResourceTree from a JSON file."""
-    import json
-    from pathlib import Path
-
     with Path(path).open() as f:
         data = json.load(f)
-    return tree_from_dict(data)
+    return tree_from_dict(data, validate=validate)
@@ -8,6 +8,8 @@ Supports:
 from __future__ import annotations
 
 import re
+from collections.abc import Callable
+from functools import lru_cache
 
 
 def match_pattern(path: str, pattern: str) -> bool:
@@ -28,9 +30,21 @@ def match_pattern(path: str, pattern: str) -> bool:
         >>> match_pattern('/infra/us/dc/server', '/infra/**/server')
         True
     """
-    # Convert pattern to regex
-    regex = pattern_to_regex(pattern)
-    return bool(re.match(regex, path))
+    return _compile_matcher(pattern)(path)
+
+
+@lru_cache(maxsize=1024)
+def _compile_matcher(pattern: str) -> Callable[[str], bool]:
+    """Compile a wildcard pattern into a path predicate, once per pattern.
+
+    A pattern without wildcards can only match one path, so it becomes a
+    plain string comparison. Anything else is matched by the compiled
+    regex, which beats a pure-Python segment matcher for these patterns.
+    """
+    if "*" not in pattern:
+        return f"/{pattern.strip('/')}".__eq__
+    regex = re.compile(pattern_to_regex(pattern))
+    return lambda path: regex.match(path) is not None
 
 
 def pattern_to_regex(pattern: str) -> str:
@@ -6,6 +6,7 @@ pre-injected. This ensures documentation examples stay in sync with the API.
 
 import pathlib
 import re
+import textwrap
 
 import pytest
 
@@ -15,8 +16,9 @@ from hrcp import Resource
 from hrcp import ResourceTree
 from hrcp import get_value
 
-# Collect all markdown files in docs/
+# Collect all markdown files in docs/, reading each once at import
 DOC_FILES = sorted(pathlib.Path("docs").glob("**/*.md"))
+DOC_TEXTS = {fpath: fpath.read_text() for fpath in DOC_FILES}
 
 # Common globals to inject into all code blocks
 HRCP_GLOBALS = {
@@ -27,6 +29,10 @@ HRCP_GLOBALS = {
     "get_value": get_value,
 }
 
+# Prototype namespace copied for each exec; __name__ != "__main__" skips
+# any if __name__ == "__main__" guards in the examples
+BLOCK_NAMESPACE = {"__name__": "__doc_test__", **HRCP_GLOBALS}
+
 
 def extract_python_blocks(text: str) -> list[str]:
     """Extract Python code blocks from markdown text.
@@ -34,34 +40,33 @@ def extract_python_blocks(text: str) -> list[str]:
     Handles both regular code blocks and indented blocks (e.g., in admonitions).
     Skips blocks that import external dependencies.
     """
-    import textwrap
-
-    pattern = r"```python\n(.*?)```"
-    blocks = re.findall(pattern, text, re.DOTALL)
-
     result = []
-    for block in blocks:
-        dedented = textwrap.dedent(block)
+    # Each chunk after an opening fence runs to its closing fence; this
+    # covers indented blocks inside admonitions too. An unclosed block
+    # at the end of the file is not a code block.
+    for chunk in text.split("```python\n")[1:]:
+        block, fence, _ = chunk.partition("```")
+        if not fence:
+            continue
+        # A block whose first line is flush-left has no common margin, so
+        # only indented blocks (e.g. in admonitions) need the dedent scan
+        dedented = textwrap.dedent(block) if block[:1] in " \t\n" else block
 
         # Skip blocks with external imports
-        has_external = any(
-            f"import {ext}" in dedented or f"from {ext}" in dedented
-            for ext in EXTERNAL_IMPORTS
-        )
-        if not has_external:
+        if not EXTERNAL_IMPORT_RE.search(dedented):
             result.append(dedented)
 
     return result
 
 
-def run_code_blocks(fpath: pathlib.Path, memory: bool = True) -> None:
+def run_code_blocks(fpath: pathlib.Path, text: str, memory: bool = True) -> None:
     """Run all Python code blocks in a markdown file.
 
     Args:
         fpath: Path to markdown file.
+        text: Contents of the markdown file.
         memory: If True, share state between code blocks (sequential execution).
     """
-    text = fpath.read_text()
     blocks = extract_python_blocks(text)
 
     if not blocks:
@@ -69,16 +74,15 @@ def run_code_blocks(fpath: pathlib.Path, memory: bool = True) -> None:
 
     if memory:
         # Sequential: run all blocks in shared namespace
-        # Use __name__ != "__main__" to skip if __name__ == "__main__" guards
-        namespace = {"__name__": "__doc_test__", **HRCP_GLOBALS}
+        namespace = BLOCK_NAMESPACE.copy()
         all_code = "\n\n".join(blocks)
-        exec(all_code, namespace)
+        exec(compile(all_code, str(fpath), "exec"), namespace)
     else:
         # Independent: each block gets fresh namespace
         for i, block in enumerate(blocks):
-            namespace = {"__name__": "__doc_test__", **HRCP_GLOBALS}
+            namespace = BLOCK_NAMESPACE.copy()
             try:
-                exec(block, namespace)
+                exec(compile(block, str(fpath), "exec"), namespace)
             except Exception as e:
                 raise AssertionError(f"Block {i + 1} failed: {e}") from e
 
@@ -88,6 +92,11 @@ SKIP_FILES: set[str] = set()
 
 # External imports that indicate a block should be skipped
 EXTERNAL_IMPORTS = {"flask", "yaml", "tomli", "tomli_w", "pyyaml"}
+# Matches "import <ext>" or "from <ext>" anywhere in a block, including
+# prefixes such as "import flask_cors" and "from ruamel import yaml"
+EXTERNAL_IMPORT_RE = re.compile(
+    r"(?:import|from) (?:" + "|".join(map(re.escape, sorted(EXTERNAL_IMPORTS))) + ")"
+)
 
 # Files where each code block should run independently (not sequentially)
 # These have multiple independent examples that would conflict
@@ -109,4 +118,21 @@ def test_docs(fpath):
         pytest.skip(f"Skipped: {fpath} contains illustrative examples")
 
     memory = fpath_str not in INDEPENDENT_BLOCKS
-    run_code_blocks(fpath, memory=memory)
+    run_code_blocks(fpath, DOC_TEXTS[fpath], memory=memory)
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "import yaml\n",
+        "    from tomli import loads\n",
+        "x = 1; import yaml\n",
+        "x = 1;from flask import Flask\n",
+        "if True: import yaml\n",
+        "from ruamel import yaml\n",
+        "import flask_cors\n",
+    ],
+)
+def test_external_import_blocks_are_skipped(code):
+    """Blocks containing "import <ext>" or "from <ext>" anywhere are skipped."""
+    assert extract_python_blocks(f"```python\n{code}```\n") == []
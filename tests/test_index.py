@@ -0,0 +1,196 @@
+"""Tests for the pre-order tree index used by bulk lookups."""
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from hrcp.core import _INDEX_MIN_MATCHES
+from hrcp.core import Resource
+from hrcp.core import ResourceTree
+from hrcp.index import TreeIndex
+from hrcp.propagation import PropagationMode
+from hrcp.provenance import get_value
+
+# Strategy for tree shapes: each entry is a path of child indexes
+tree_paths = st.lists(
+    st.lists(st.integers(min_value=0, max_value=2), min_size=1, max_size=4),
+    max_size=15,
+)
+
+
+def wide_tree():
+    """Build a tree with enough children for query_values to index "/root/*"."""
+    tree = ResourceTree(root_name="root")
+    for n in range(_INDEX_MIN_MATCHES):
+        tree.create(f"/root/f{n}")
+    return tree
+
+
+def build_tree(paths):
+    """Build a tree from index paths, tagging some resources with a value."""
+    tree = ResourceTree(root_name="root")
+    tree.root.set_attribute("cost", -1)
+    for n, path in enumerate(paths):
+        full = "/root/" + "/".join(f"c{i}" for i in path)
+        resource = tree.get(full) or tree.create(full)
+        if n % 2 == 0:
+            resource.set_attribute("cost", n)
+    return tree
+
+
+class TestTreeIndexLookups:
+    """Test that indexed lookups match propagation through get_value."""
+
+    @given(paths=tree_paths)
+    def test_aggregate_matches_get_value(self, paths):
+        """Every subtree slice equals the AGGREGATE value, in order."""
+        tree = build_tree(paths)
+        index = TreeIndex(tree.root, tree.root._clock.generation)
+
+        for resource in tree.walk():
+            expected = get_value(resource, "cost", PropagationMode.AGGREGATE)
+            assert index.aggregate(resource, "cost") == expected
+
+    @given(paths=tree_paths)
+    def test_inherit_matches_get_value(self, paths):
+        """Indexed inheritance equals INHERIT for every resource."""
+        tree = build_tree(paths)
+        index = TreeIndex(tree.root, tree.root._clock.generation)
+
+        for resource in tree.walk():
+            expected = get_value(resource, "cost", PropagationMode.INHERIT)
+            assert index.inherit(resource, "cost") == expected
+
+    def test_aggregate_missing_key_is_empty(self):
+        """A key no resource has aggregates to an empty list."""
+        tree = ResourceTree(root_name="root")
+        tree.create("/root/a")
+        index = TreeIndex(tree.root, tree.root._clock.generation)
+
+        assert index.aggregate(tree.root, "missing") == []
+
+
+class TestQueryValuesIndex:
+    """Test that query_values never reads a stale index."""
+
+    def test_query_values_sees_new_values(self):
+        """Values added after a query are included in the next one."""
+        tree = wide_tree()
+        tree.create("/root/a/x", attributes={"cost": 1})
+        tree.create("/root/b")
+        assert tree.query_values("/root/*", "cost", PropagationMode.UP) == [1]
+
+        tree.create("/root/b/y", attributes={"cost": 2})
+        tree.get("/root/a/x").set_attribute("cost", 3)
+
+        assert tree.query_values("/root/*", "cost", PropagationMode.UP) == [3, 2]
+
+    def test_query_values_sees_deleted_resources(self):
+        """Deleted resources no longer contribute values."""
+        tree = wide_tree()
+        tree.create("/root/a/x", attributes={"cost": 1})
+        tree.create("/root/b/y", attributes={"cost": 2})
+        assert tree.query_values("/root/*", "cost", PropagationMode.UP) == [1, 2]
+
+        tree.delete("/root/a/x")
+
+        assert tree.query_values("/root/*", "cost", PropagationMode.UP) == [2]
+
+    def test_walk_after_query_values_sees_changes(self):
+        """walk() reflects structure changes made after an indexed query."""
+        tree = wide_tree()
+        tree.create("/root/a/x", attributes={"cost": 1})
+        tree.query_values("/root/*", "cost", PropagationMode.UP)
+        assert [r.path for r in tree.walk("/root/a")] == ["/root/a", "/root/a/x"]
+
+        tree.create("/root/a/y")
+        tree.delete("/root/a/x")
+
+        assert [r.path for r in tree.walk("/root/a")] == ["/root/a", "/root/a/y"]
+
+    def test_other_tree_changes_keep_index(self):
+        """Writes to an unrelated tree do not force a rebuild."""
+        tree = wide_tree()
+        tree.create("/root/a", attributes={"cost": 1})
+        other = ResourceTree(root_name="root")
+        tree.query_values("/root/*", "cost", PropagationMode.UP)
+        index = tree._index
+
+        other.root.set_attribute("cost", 2)
+        other.create("/root/b")
+
+        assert tree.query_values("/root/*", "cost", PropagationMode.UP) == [1]
+        assert index is not None
+        assert tree._index is index
+
+    def test_query_values_sees_changes_in_attached_subtree(self):
+        """A subtree built on its own and then added is tracked by the tree."""
+        tree = wide_tree()
+        region = Resource(name="region")
+        host = Resource(name="host", attributes={"cost": 1})
+        region.add_child(host)
+        tree.root.add_child(region)
+        assert tree.query_values("/root/*", "cost", PropagationMode.UP) == [1]
+
+        host.set_attribute("cost", 2)
+
+        assert tree.query_values("/root/*", "cost", PropagationMode.UP) == [2]
+
+    def test_query_values_sees_in_place_union(self):
+        """Merging into attributes with |= is seen like any other write."""
+        tree = wide_tree()
+        a = tree.create("/root/a", attributes={"cost": 1})
+        assert tree.query_values("/root/*", "cost", PropagationMode.UP) == [1]
+
+        attributes = a.attributes
+        attributes |= {"cost": 2}
+
+        assert tree.query_values("/root/*", "cost", PropagationMode.UP) == [2]
+
+    def test_inherit_sees_ancestor_changes(self):
+        """Indexed INHERIT lookups see a changed ancestor value."""
+        tree = wide_tree()
+        tree.root.set_attribute("region", "us")
+        mode = PropagationMode.INHERIT
+        assert (
+            tree.query_values("/root/*", "region", mode) == ["us"] * _INDEX_MIN_MATCHES
+        )
+
+        tree.root.set_attribute("region", "eu")
+
+        assert (
+            tree.query_values("/root/*", "region", mode) == ["eu"] * _INDEX_MIN_MATCHES
+        )
+
+    def test_require_path_sees_in_place_emptied_value(self):
+        """Emptying an ancestor's value in place fails the path check."""
+        tree = ResourceTree(root_name="root")
+        tree.root.set_attribute("regions", ["us"])
+        tree.create("/root/team", attributes={"regions": ["us"]})
+        mode = PropagationMode.REQUIRE_PATH
+        assert tree.query_values("/root/*", "regions", mode) == [["us"]]
+
+        tree.root.attributes["regions"].clear()
+
+        assert tree.query_values("/root/*", "regions", mode) == []
+
+    @pytest.mark.parametrize("mode", [PropagationMode.UP, PropagationMode.INHERIT])
+    def test_few_matches_do_not_rebuild_index(self, mode):
+        """A query with few matches after a write leaves the stale index alone."""
+        tree = wide_tree()
+        tree.create("/root/a/x", attributes={"cost": 1})
+        tree.query_values("/root/*", "cost", mode)
+        index = tree._index
+
+        tree.get("/root/a/x").set_attribute("cost", 2)
+
+        assert tree.query_values("/root/a/x", "cost", mode) == [2]
+        assert tree._index is index
+
+    def test_few_matches_build_no_index(self):
+        """A query with few matches on a fresh tree resolves without indexing."""
+        tree = ResourceTree(root_name="root")
+        tree.create("/root/a/x", attributes={"cost": 1})
+
+        assert tree.query_values("/root/*", "cost", PropagationMode.UP) == [1]
+        assert tree._index is None
@@ -48,6 +48,18 @@ class TestJoinPath:
         result = join_path(f"/{base}", f"/{child}")
         assert result == f"/{base}/{child}"
 
+    @given(name=segment)
+    def test_join_single_segment(self, name):
+        """join_path with a single segment yields a one-level path."""
+        assert join_path(name) == f"/{name}"
+        assert join_path(f"/{name}/") == f"/{name}"
+
+    def test_join_single_empty_segment(self):
+        """join_path of an empty or slash-only segment is the root."""
+        assert join_path("") == "/"
+        assert join_path("/") == "/"
+        assert join_path("//") == "/"
+
 
 class TestSplitPath:
     """Test path splitting."""
@@ -1,5 +1,8 @@
 """Tests for HRCP propagation modes - how values flow through the hierarchy."""
 
+from collections import Counter
+
+import pytest
 from hypothesis import given
 from hypothesis import strategies as st
 
@@ -68,9 +71,8 @@ class TestPropagationDown:
         tree = ResourceTree(root_name=root_name)
         tree.root.set_attribute(key, value)
         path = f"/{root_name}/" + "/".join(names)
-        tree.create(path)
+        leaf = tree.create(path)
 
-        leaf = tree.get(path)
         result = get_value(leaf, key, PropagationMode.DOWN)
 
         assert result == value
@@ -136,29 +138,27 @@ class TestPropagationUp:
 
         result = get_value(tree.root, key, PropagationMode.UP)
 
-        assert sorted(result) == sorted(used_values)
+        assert Counter(result) == Counter(used_values)
 
     @given(
         root_name=valid_name,
-        region1=valid_name,
-        region2=valid_name,
+        regions=st.lists(valid_name, min_size=2, max_size=2, unique=True),
         key=valid_name,
         val1=st.integers(),
         val2=st.integers(),
     )
     def test_up_collects_from_all_descendants(
-        self, root_name, region1, region2, key, val1, val2
+        self, root_name, regions, key, val1, val2
     ):
         """UP aggregates values from all descendants, not just children."""
-        if region1 == region2:
-            region2 = region2 + "2"
+        region1, region2 = regions
         tree = ResourceTree(root_name=root_name)
         tree.create(f"/{root_name}/{region1}/server", attributes={key: val1})
         tree.create(f"/{root_name}/{region2}/server", attributes={key: val2})
 
         result = get_value(tree.root, key, PropagationMode.UP)
 
-        assert sorted(result) == sorted([val1, val2])
+        assert Counter(result) == Counter([val1, val2])
 
     @given(
         root_name=valid_name,
@@ -177,7 +177,7 @@ class TestPropagationUp:
 
         result = get_value(tree.root, key, PropagationMode.UP)
 
-        assert sorted(result) == sorted([child_val, root_val])
+        assert Counter(result) == Counter([child_val, root_val])
 
     @given(root_name=valid_name, child_name=valid_name, key=valid_name)
     def test_up_returns_empty_list_if_not_found(self, root_name, child_name, key):
@@ -210,22 +210,14 @@ class TestPropagationMergeDown:
     @given(
         root_name=valid_name,
         child_name=valid_name,
-        k1=valid_name,
-        k2=valid_name,
-        k3=valid_name,
+        keys=st.lists(valid_name, min_size=3, max_size=3, unique=True),
         v1=st.integers(),
         v2=st.integers(),
         v3=st.integers(),
     )
-    def test_merge_down_combines_dicts(
-        self, root_name, child_name, k1, k2, k3, v1, v2, v3
-    ):
+    def test_merge_down_combines_dicts(self, root_name, child_name, keys, v1, v2, v3):
         """MERGE_DOWN deep-merges dict values from ancestors."""
-        # Ensure distinct keys
-        if k1 == k2:
-            k2 = k2 + "2"
-        if k3 in (k2, k1):
-            k3 = k3 + "3"
+        k1, k2, k3 = keys
         tree = ResourceTree(root_name=root_name)
         tree.root.set_attribute("config", {k1: v1, k2: v2})
         child = tree.create(
@@ -246,12 +238,11 @@ class TestPropagationMergeDown:
             f"/{root_name}/{mid_name}",
             attributes={"config": {"level": "region", "y": 2}},
         )
-        tree.create(
+        server = tree.create(
             f"/{root_name}/{mid_name}/{leaf_name}",
             attributes={"config": {"level": "server", "z": 3}},
         )
 
-        server = tree.get(f"/{root_name}/{mid_name}/{leaf_name}")
         result = get_value(server, "config", PropagationMode.MERGE_DOWN)
 
         assert result == {"level": "server", "x": 1, "y": 2, "z": 3}
@@ -310,6 +301,19 @@ class TestPropagationMergeDown:
 
         assert result == child_val
 
+    def test_merge_down_ancestor_non_dict_stops_merge(self):
+        """A non-dict anywhere in the chain makes the closest value win."""
+        tree = ResourceTree(root_name="root")
+        tree.root.set_attribute("config", {"a": 1})
+        tree.create("/root/mid", attributes={"config": "disabled"})
+        leaf = tree.create("/root/mid/leaf", attributes={"config": {"b": 2}})
+
+        prov = get_value(leaf, "config", PropagationMode.MERGE, with_provenance=True)
+
+        assert get_value(leaf, "config", PropagationMode.MERGE) == {"b": 2}
+        assert prov.value == {"b": 2}
+        assert prov.source_path == "/root/mid/leaf"
+
 
 class TestPropagationNone:
     """Test NONE propagation - no inheritance, only local values."""
@@ -381,6 +385,33 @@ class TestPropagationRequirePath:
 
         assert result is True
 
+    def test_require_path_siblings_follow_ancestor_changes(self):
+        """Siblings sharing ancestors all see an ancestor being switched off."""
+        tree = ResourceTree(root_name="org")
+        tree.root.set_attribute("enabled", True)
+        team = tree.create("/org/team", attributes={"enabled": True})
+        a = tree.create("/org/team/a", attributes={"enabled": True})
+        b = tree.create("/org/team/b", attributes={"enabled": True})
+        assert get_value(a, "enabled", PropagationMode.REQUIRE_PATH) is True
+        assert get_value(b, "enabled", PropagationMode.REQUIRE_PATH) is True
+
+        team.set_attribute("enabled", False)
+
+        assert get_value(a, "enabled", PropagationMode.REQUIRE_PATH) is None
+        assert get_value(b, "enabled", PropagationMode.REQUIRE_PATH) is None
+        assert get_value(team, "enabled", PropagationMode.REQUIRE_PATH) is None
+
+    def test_require_path_sees_in_place_emptied_value(self):
+        """An ancestor value emptied in place becomes falsy for descendants."""
+        tree = ResourceTree(root_name="org")
+        tree.root.set_attribute("regions", ["us"])
+        leaf = tree.create("/org/team", attributes={"regions": ["us"]})
+        assert get_value(leaf, "regions", PropagationMode.REQUIRE_PATH) == ["us"]
+
+        tree.root.attributes["regions"].clear()
+
+        assert get_value(leaf, "regions", PropagationMode.REQUIRE_PATH) is None
+
     def test_require_path_local_missing(self):
         """Returns None if local value is missing."""
         tree = ResourceTree(root_name="org")
@@ -703,3 +734,11 @@ class TestGetValueCombined:
         result = get_value(child, key, PropagationMode.DOWN, with_provenance=True)
 
         assert result is None
+
+    @pytest.mark.parametrize("with_provenance", [False, True])
+    def test_get_value_unknown_mode_raises(self, with_provenance):
+        """get_value rejects anything that is not a PropagationMode."""
+        tree = ResourceTree(root_name="root")
+
+        with pytest.raises(ValueError, match="Unknown propagation mode"):
+            get_value(tree.root, "key", "INHERIT", with_provenance=with_provenance)
@@ -1,5 +1,6 @@
 """Tests for HRCP provenance tracking - knowing where values came from."""
 
+import pytest
 from hypothesis import given
 from hypothesis import strategies as st
 
@@ -57,6 +58,11 @@ class TestProvenanceDataClass:
         )
         assert prov.key_sources == {k1: "/root", k2: "/root/child"}
 
+    def test_provenance_has_no_instance_dict(self):
+        """Provenance uses slots, so instances carry no per-instance __dict__."""
+        prov = Provenance(value=1, source_path="/root", mode=PropagationMode.NONE)
+        assert not hasattr(prov, "__dict__")
+
     @given(values=st.lists(st.integers(), min_size=1, max_size=5))
     def test_provenance_for_aggregated_values(self, values):
         """Provenance for UP tracks all contributing sources."""
@@ -309,3 +315,189 @@ class TestProvenanceMergeDownEdgeCases:
         assert prov.value["level1"]["level2"]["other"] == "root_other"
         assert prov.key_sources["level1.level2.level3"] == f"/{root_name}/{child_name}"
         assert prov.key_sources["level1.level2.other"] == f"/{root_name}"
+
+    def test_merge_down_does_not_mutate_ancestor_attributes(self):
+        """Resolving a MERGE_DOWN value leaves every source dict untouched."""
+        tree = ResourceTree(root_name="root")
+        tree.root.set_attribute("config", {"logging": {"level": "INFO"}})
+        child = tree.create(
+            "/root/child", attributes={"config": {"logging": {"format": "json"}}}
+        )
+
+        prov = get_value(
+            child, "config", PropagationMode.MERGE_DOWN, with_provenance=True
+        )
+
+        assert prov.value == {"logging": {"level": "INFO", "format": "json"}}
+        assert tree.root.attributes["config"] == {"logging": {"level": "INFO"}}
+        assert child.attributes["config"] == {"logging": {"format": "json"}}
+
+    def test_merge_down_very_deep_dict(self):
+        """MERGE_DOWN handles dicts nested deeper than the recursion limit."""
+        depth = 2000
+        deep: dict = {"leaf": "root_value"}
+        for _ in range(depth):
+            deep = {"n": deep}
+        tree = ResourceTree(root_name="root")
+        tree.root.set_attribute("config", deep)
+
+        prov = get_value(
+            tree.root, "config", PropagationMode.MERGE_DOWN, with_provenance=True
+        )
+
+        assert prov.key_sources[".".join(["n"] * depth + ["leaf"])] == "/root"
+
+
+class TestValueFreshness:
+    """Test that lookups always reflect the current tree."""
+
+    def test_repeated_calls_return_same_result(self):
+        """Repeated lookups return equal values and provenance."""
+        tree = ResourceTree(root_name="root")
+        tree.root.set_attribute("config", {"a": 1})
+        child = tree.create("/root/child", attributes={"config": {"b": 2}})
+
+        first = get_value(child, "config", PropagationMode.MERGE, with_provenance=True)
+        second = get_value(child, "config", PropagationMode.MERGE, with_provenance=True)
+
+        assert first == second
+        assert get_value(child, "config", PropagationMode.MERGE) == {"a": 1, "b": 2}
+
+    def test_nested_in_place_change_is_seen(self):
+        """Editing a stored dict in place is seen by the next lookup."""
+        tree = ResourceTree(root_name="root")
+        tree.root.set_attribute("cfg", {"db": {"port": 1}})
+        child = tree.create("/root/child", attributes={"cfg": {"db": {"host": "x"}}})
+        assert get_value(child, "cfg", PropagationMode.MERGE)["db"]["port"] == 1
+
+        tree.root.attributes["cfg"]["db"]["port"] = 2
+
+        assert get_value(child, "cfg", PropagationMode.MERGE)["db"]["port"] == 2
+
+    @pytest.mark.parametrize("with_provenance", [False, True])
+    def test_results_are_not_shared(self, with_provenance):
+        """Mutating one result does not affect later lookups."""
+        tree = ResourceTree(root_name="root")
+        tree.root.set_attribute("cfg", {"a": 1})
+        child = tree.create("/root/child", attributes={"cfg": {"b": 2}, "cost": 3})
+
+        for mode, key in [
+            (PropagationMode.MERGE, "cfg"),
+            (PropagationMode.AGGREGATE, "cost"),
+        ]:
+            first = get_value(child, key, mode, with_provenance=with_provenance)
+            second = get_value(child, key, mode, with_provenance=with_provenance)
+            assert first is not second
+            if with_provenance:
+                assert first.value is not second.value
+                assert first.key_sources is not second.key_sources
+
+    def test_ancestor_set_attribute_invalidates(self):
+        """Changing an ancestor attribute is seen by descendants."""
+        tree = ResourceTree(root_name="root")
+        tree.root.set_attribute("region", "us-east-1")
+        child = tree.create("/root/child")
+        assert get_value(child, "region", PropagationMode.INHERIT) == "us-east-1"
+
+        tree.root.set_attribute("region", "eu-west-1")
+
+        assert get_value(child, "region", PropagationMode.INHERIT) == "eu-west-1"
+
+    def test_direct_attributes_mutation_invalidates(self):
+        """Mutating the attributes mapping directly is also detected."""
+        tree = ResourceTree(root_name="root")
+        child = tree.create("/root/child")
+        assert get_value(child, "region", PropagationMode.INHERIT) is None
+
+        tree.root.attributes["region"] = "us-east-1"
+        assert get_value(child, "region", PropagationMode.INHERIT) == "us-east-1"
+
+        tree.root.attributes.pop("region")
+        assert get_value(child, "region", PropagationMode.INHERIT) is None
+
+        tree.root.attributes.update(region="eu-west-1")
+        assert get_value(child, "region", PropagationMode.INHERIT) == "eu-west-1"
+
+    def test_delete_attribute_invalidates(self):
+        """Deleting an attribute is seen by later lookups."""
+        tree = ResourceTree(root_name="root")
+        tree.root.set_attribute("port", 8080)
+        assert get_value(tree.root, "port", PropagationMode.NONE) == 8080
+
+        tree.root.delete_attribute("port")
+
+        assert get_value(tree.root, "port", PropagationMode.NONE) is None
+
+    def test_structure_changes_invalidate(self):
+        """Adding and deleting resources is seen by AGGREGATE lookups."""
+        tree = ResourceTree(root_name="root")
+        tree.create("/root/a", attributes={"cost": 1})
+        assert get_value(tree.root, "cost", PropagationMode.AGGREGATE) == [1]
+
+        tree.create("/root/b", attributes={"cost": 2})
+        assert get_value(tree.root, "cost", PropagationMode.AGGREGATE) == [1, 2]
+
+        tree.delete("/root/a")
+        assert get_value(tree.root, "cost", PropagationMode.AGGREGATE) == [2]
+
+    def test_aliased_modes_share_results(self):
+        """Deprecated aliases resolve identically to their new names."""
+        tree = ResourceTree(root_name="root")
+        tree.root.set_attribute("env", "prod")
+        child = tree.create("/root/child")
+
+        assert get_value(child, "env", PropagationMode.DOWN) == get_value(
+            child, "env", PropagationMode.INHERIT
+        )
+
+
+class TestValueOnlyPath:
+    """Test that value-only lookups agree with provenance lookups."""
+
+    @pytest.fixture
+    def tree(self):
+        """A small tree exercising every propagation mode."""
+        tree = ResourceTree(root_name="root")
+        tree.root.set_attribute("config", {"log": {"level": "INFO"}, "x": 1})
+        tree.root.set_attribute("enabled", True)
+        tree.create(
+            "/root/mid",
+            attributes={"config": {"log": {"format": "json"}}, "enabled": True},
+        )
+        tree.create(
+            "/root/mid/leaf",
+            attributes={"config": {"x": 2}, "enabled": True, "cost": 3},
+        )
+        tree.create("/root/other", attributes={"cost": 4, "enabled": False})
+        return tree
+
+    @pytest.mark.parametrize("mode", list(PropagationMode))
+    @pytest.mark.parametrize("key", ["config", "enabled", "cost", "missing"])
+    @pytest.mark.parametrize("path", ["/root", "/root/mid/leaf", "/root/other"])
+    def test_value_matches_provenance(self, tree, mode, key, path):
+        """get_value returns exactly the value its Provenance would carry."""
+        resource = tree.get(path)
+
+        value = get_value(resource, key, mode, default="fallback")
+        prov = get_value(resource, key, mode, with_provenance=True)
+
+        if prov is None:
+            assert value == "fallback"
+        else:
+            assert value == prov.value
+
+    def test_aggregate_very_deep_tree(self):
+        """AGGREGATE walks trees deeper than the recursion limit in order."""
+        tree = ResourceTree(root_name="root")
+        current = tree.root
+        for i in range(2000):
+            current = tree.create(f"{current.path}/n{i}", attributes={"v": i})
+
+        value = get_value(tree.root, "v", PropagationMode.AGGREGATE)
+        prov = get_value(
+            tree.root, "v", PropagationMode.AGGREGATE, with_provenance=True
+        )
+
+        assert value == list(range(2000))
+        assert prov.value == value
+        assert prov.contributing_paths[-1] == current.path
@@ -56,6 +56,11 @@ class TestResourceCreation:
         resource = Resource(name=name)
         assert resource.children == {}
 
+    def test_resource_has_no_instance_dict(self):
+        """Resource uses slots, so instances carry no per-instance __dict__."""
+        resource = Resource(name="root")
+        assert not hasattr(resource, "__dict__")
+
     def test_resource_name_cannot_be_empty(self):
         """A Resource must have a non-empty name."""
         with pytest.raises(ValueError, match="name cannot be empty"):
@@ -203,6 +208,20 @@ class TestResourcePath:
         expected_path = "/" + "/".join(names)
         assert resources[-1].path == expected_path
 
+    @given(names=st.lists(valid_name, min_size=4, max_size=4, unique=True))
+    def test_path_updates_when_subtree_is_reparented(self, names):
+        """Cached paths of a moved subtree reflect its new location."""
+        old_root, new_root, child, grandchild = (Resource(name=n) for n in names)
+        old_root.add_child(child)
+        child.add_child(grandchild)
+        assert grandchild.path == f"/{names[0]}/{names[2]}/{names[3]}"
+
+        old_root.remove_child(child.name)
+        assert grandchild.path == f"/{names[2]}/{names[3]}"
+
+        new_root.add_child(child)
+        assert grandchild.path == f"/{names[1]}/{names[2]}/{names[3]}"
+
 
 class TestResourceAttributes:
     """Test Resource attribute operations."""
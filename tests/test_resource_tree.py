@@ -1,11 +1,15 @@
 """Tests for the ResourceTree class - the container for HRCP hierarchy."""
 
+import pickle
+
 import pytest
 from hypothesis import given
 from hypothesis import strategies as st
 
+from hrcp.core import _INDEX_MIN_MATCHES
 from hrcp.core import Resource
 from hrcp.core import ResourceTree
+from hrcp.propagation import PropagationMode
 
 # Strategy for valid resource names
 valid_name = st.text(
@@ -118,6 +122,33 @@ class TestResourceTreePathAccess:
 
         assert result is None
 
+    def test_get_follows_structure_changes(self):
+        """get() never returns a Resource that has moved or been removed."""
+        tree = ResourceTree(root_name="root")
+        a = tree.create("/root/a")
+        assert tree.get("/root/a") is a
+
+        tree.delete("/root/a")
+        assert tree.get("/root/a") is None
+
+        b = tree.create("/root/a")
+        assert tree.get("/root/a") is b
+
+        other = ResourceTree(root_name="root")
+        other.root.add_child(tree.root.remove_child("a"))
+        assert tree.get("/root/a") is None
+        assert other.get("/root/a") is b
+
+    def test_get_unaffected_by_attribute_changes(self):
+        """Attribute changes do not change which Resource a path names."""
+        tree = ResourceTree(root_name="root")
+        a = tree.create("/root/a")
+        assert tree.get("/root/a") is a
+
+        a.set_attribute("port", 80)
+
+        assert tree.get("/root/a") is a
+
 
 class TestResourceTreeCreationAtPath:
     """Test creating Resources at specific paths."""
@@ -161,6 +192,19 @@ class TestResourceTreeCreationAtPath:
             assert tree.get(partial_path) is not None
         assert tree.get(path) is leaf
 
+    @given(names=st.lists(valid_name, min_size=2, max_size=4, unique=True))
+    def test_create_below_existing_prefix_reuses_it(self, names):
+        """Existing ancestors are reused and only the new leaf gets attributes."""
+        tree = ResourceTree(root_name="root")
+        prefix = tree.create("/root/" + "/".join(names[:-1]), attributes={"a": 1})
+
+        leaf = tree.create("/root/" + "/".join(names), attributes={"b": 2})
+
+        assert leaf.parent is prefix
+        assert prefix.attributes == {"a": 1}
+        assert leaf.attributes == {"b": 2}
+        assert len(tree) == len(names) + 1
+
     @given(root_name=valid_name, child_name=valid_name)
     def test_create_at_existing_path_raises(self, root_name, child_name):
         """Creating at an existing path raises ValueError."""
@@ -279,6 +323,47 @@ class TestResourceTreeTraversal:
         with pytest.raises(KeyError):
             list(tree.walk(f"/{fake_name}"))
 
+    def test_walk_is_depth_first_preorder(self):
+        """walk() yields each Resource before its children, in child order."""
+        tree = ResourceTree(root_name="root")
+        tree.create("/root/a/x")
+        tree.create("/root/a/y")
+        tree.create("/root/b")
+
+        paths = [r.path for r in tree.walk()]
+
+        assert paths == ["/root", "/root/a", "/root/a/x", "/root/a/y", "/root/b"]
+
+    @pytest.mark.parametrize("indexed", [False, True])
+    def test_walk_sees_changes_made_mid_walk(self, indexed):
+        """Children added or removed below unvisited Resources are seen."""
+        tree = ResourceTree(root_name="root")
+        tree.create("/root/a/x", attributes={"cost": 1})
+        tree.create("/root/b/y")
+        if indexed:
+            # Building the query index must not change how walk() behaves
+            tree.query_values("/root", "cost", PropagationMode.UP)
+
+        paths = []
+        for resource in tree.walk():
+            paths.append(resource.path)
+            if resource.path == "/root/a":
+                tree.create("/root/a/new")
+                tree.delete("/root/b/y")
+
+        assert paths == ["/root", "/root/a", "/root/a/x", "/root/a/new", "/root/b"]
+
+    def test_walk_deep_tree(self):
+        """walk() handles trees deeper than the recursion limit."""
+        tree = ResourceTree(root_name="root")
+        current = tree.root
+        for i in range(2000):
+            child = Resource(name=f"n{i}")
+            current.add_child(child)
+            current = child
+
+        assert sum(1 for _ in tree.walk()) == 2001
+
 
 class TestResourceTreeSize:
     """Test tree size/count operations."""
@@ -300,3 +385,81 @@ class TestResourceTreeSize:
             tree.create(f"/{root_name}/{name}")
 
         assert len(tree) == 1 + len(child_names)
+
+    @given(
+        root_name=valid_name,
+        child_names=st.lists(valid_name, min_size=1, max_size=4, unique=True),
+    )
+    def test_tree_size_matches_walk(self, root_name, child_names):
+        """len(tree) counts nested Resources exactly as walk() visits them."""
+        tree = ResourceTree(root_name=root_name)
+        for name in child_names:
+            tree.create(f"/{root_name}/{name}")
+            tree.create(f"/{root_name}/{name}/leaf")
+
+        assert len(tree) == sum(1 for _ in tree.walk())
+
+
+class TestResourceTreeChangeTracking:
+    """Test that every change to a tree advances its clock."""
+
+    @pytest.mark.parametrize(
+        "change",
+        [
+            lambda tree: tree.create("/root/b"),
+            lambda tree: tree.delete("/root/a"),
+            lambda tree: tree.get("/root/a").set_attribute("k", 2),
+            lambda tree: tree.get("/root/a").delete_attribute("k"),
+            lambda tree: tree.get("/root/a").attributes.update(k=2),
+            lambda tree: tree.get("/root/a").attributes.pop("k"),
+        ],
+    )
+    def test_change_advances_generation(self, change):
+        """Structure changes and attribute writes each advance the clock."""
+        tree = ResourceTree(root_name="root")
+        tree.create("/root/a", attributes={"k": 1})
+        before = tree.root._clock.generation
+
+        change(tree)
+
+        assert tree.root._clock.generation != before
+
+    def test_trees_have_separate_clocks(self):
+        """A write to one tree leaves another tree's clock alone."""
+        first = ResourceTree(root_name="root")
+        second = ResourceTree(root_name="root")
+        before = second.root._clock.generation
+
+        first.root.set_attribute("k", 1)
+
+        assert second.root._clock.generation == before
+
+    def test_attached_subtree_joins_tree_clock(self):
+        """Writes inside a prebuilt subtree count once it is attached."""
+        tree = ResourceTree(root_name="root")
+        branch = Resource(name="branch")
+        leaf = Resource(name="leaf")
+        branch.add_child(leaf)
+        tree.root.add_child(branch)
+        before = tree.root._clock.generation
+
+        leaf.set_attribute("k", 1)
+
+        assert tree.root._clock.generation != before
+
+    def test_pickled_tree_drops_derived_lookups(self):
+        """Unpickling rebuilds the index and path cache under a new clock."""
+        tree = ResourceTree(root_name="root")
+        for n in range(_INDEX_MIN_MATCHES):
+            tree.create(f"/root/r{n}", attributes={"k": n})
+        assert tree.query_values("/root/*", "k", PropagationMode.UP)
+        assert tree._index is not None
+
+        restored = pickle.loads(pickle.dumps(tree))
+
+        assert restored._index is None
+        assert restored._path_cache == {}
+        assert restored.root._clock is not tree.root._clock
+        restored.get("/root/r1").set_attribute("k", -1)
+        values = restored.query_values("/root/*", "k", PropagationMode.UP)
+        assert values == [0, -1, *range(2, _INDEX_MIN_MATCHES)]
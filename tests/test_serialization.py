@@ -4,9 +4,11 @@ import json
 import tempfile
 from pathlib import Path
 
+import pytest
 from hypothesis import given
 from hypothesis import strategies as st
 
+from hrcp.core import Resource
 from hrcp.core import ResourceTree
 
 # Strategy for valid resource names
@@ -95,6 +97,48 @@ class TestToDict:
         assert child2 in data["children"]
         assert data["children"][child2]["attributes"]["shallow"] is True
 
+    @given(children=st.lists(valid_name, min_size=2, max_size=5, unique=True))
+    def test_to_dict_preserves_child_order(self, children):
+        """Children are serialized in insertion order at every level."""
+        tree = ResourceTree(root_name="root")
+        for name in children:
+            tree.create(f"/root/{name}")
+            for sub in reversed(children):
+                tree.create(f"/root/{name}/{sub}")
+
+        data = tree.to_dict()
+
+        assert list(data["children"]) == children
+        for name in children:
+            nested = data["children"][name]["children"]
+            assert list(nested) == list(reversed(children))
+
+    def test_to_dict_deep_tree(self):
+        """Trees deeper than the recursion limit serialize fully."""
+        tree = ResourceTree(root_name="root")
+        current = tree.root
+        for i in range(2000):
+            child = Resource(name=f"n{i}", attributes={"depth": i})
+            current.add_child(child)
+            current = child
+
+        data = tree.to_dict()
+
+        for i in range(2000):
+            data = data["children"][f"n{i}"]
+            assert data["attributes"] == {"depth": i}
+        assert data["children"] == {}
+
+    def test_to_dict_copies_attributes(self):
+        """Mutating serialized attributes does not touch the tree."""
+        tree = ResourceTree(root_name="root")
+        tree.create("/root/a", attributes={"port": 80})
+
+        data = tree.to_dict()
+        data["children"]["a"]["attributes"]["port"] = 443
+
+        assert tree.get("/root/a").attributes["port"] == 80
+
 
 class TestFromDict:
     """Test ResourceTree.from_dict() deserialization."""
@@ -159,6 +203,58 @@ class TestFromDict:
         assert restored.get(f"/{root}/{child1}/b").attributes["value"] == val
         assert restored.get(f"/{root}/{child2}/y/z").attributes["nested"] is True
 
+    def test_from_dict_deep_tree(self):
+        """Trees deeper than the recursion limit load fully."""
+        data = {"name": "root", "children": {}}
+        node = data
+        for i in range(2000):
+            child = {"name": f"n{i}", "attributes": {"depth": i}}
+            node["children"] = {f"n{i}": child}
+            node = child
+
+        tree = ResourceTree.from_dict(data)
+
+        assert len(tree) == 2001
+        path = "/root/" + "/".join(f"n{i}" for i in range(2000))
+        assert tree.get(path).attributes == {"depth": 1999}
+
+    def test_from_dict_keeps_child_order(self):
+        """Children are added in data order, depth-first."""
+        data = {
+            "name": "root",
+            "children": {
+                "b": {
+                    "name": "b",
+                    "children": {"y": {"name": "y"}, "x": {"name": "x"}},
+                },
+                "a": {"name": "a"},
+            },
+        }
+
+        tree = ResourceTree.from_dict(data)
+
+        paths = [r.path for r in tree.walk()]
+        assert paths == ["/root", "/root/b", "/root/b/y", "/root/b/x", "/root/a"]
+
+    def test_from_dict_without_validation_roundtrips(self):
+        """Trusted data loads to the same tree with validation skipped."""
+        tree = ResourceTree(root_name="root")
+        tree.root.set_attribute("env", "prod")
+        tree.create("/root/a/x", attributes={"port": 80})
+        tree.create("/root/b")
+        data = tree.to_dict()
+
+        restored = ResourceTree.from_dict(data, validate=False)
+
+        assert restored.to_dict() == data
+
+    def test_from_dict_without_validation_still_checks_names(self):
+        """Skipping validation still rejects invalid Resource names."""
+        data = {"name": "root", "children": {"bad": {"name": "a/b"}}}
+
+        with pytest.raises(ValueError, match="cannot contain"):
+            ResourceTree.from_dict(data, validate=False)
+
 
 class TestToJson:
     """Test ResourceTree.to_json() file serialization."""
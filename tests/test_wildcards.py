@@ -5,6 +5,7 @@ from hypothesis import strategies as st
 
 from hrcp.core import ResourceTree
 from hrcp.propagation import PropagationMode
+from hrcp.wildcards import match_pattern
 
 # Strategy for valid resource names
 valid_name = st.text(
@@ -637,3 +638,54 @@ class TestPatternToRegexCorrectness:
 
         paths = [r.path for r in results]
         assert f"/{root}/a/b/c" in paths
+
+
+class TestMatchPattern:
+    """Test match_pattern() directly."""
+
+    @given(
+        names=st.lists(valid_name, min_size=1, max_size=5),
+        other=valid_name,
+    )
+    def test_repeated_pattern_gives_same_results(self, names, other):
+        """Reusing a pattern for many paths matches each path correctly."""
+        pattern = "/root/*/leaf"
+        for name in names:
+            assert match_pattern(f"/root/{name}/leaf", pattern)
+            assert not match_pattern(f"/root/{name}/{other}x/leaf", pattern)
+
+    @given(names=st.lists(valid_name, min_size=1, max_size=4), other=valid_name)
+    def test_literal_pattern_matches_only_its_path(self, names, other):
+        """A pattern without wildcards matches exactly one path."""
+        path = "/" + "/".join(names)
+
+        assert match_pattern(path, path)
+        assert match_pattern(path, path.lstrip("/") + "/")
+        assert not match_pattern(f"{path}/{other}", path)
+        assert not match_pattern(path, f"{path}/{other}")
+
+    @given(
+        paths=st.lists(
+            st.lists(st.sampled_from(["a", "b", "ab"]), min_size=1, max_size=4),
+            max_size=10,
+        ),
+        pattern=st.lists(
+            st.sampled_from(["root", "a", "b", "ab", "*", "**", "a*", "x", ""]),
+            max_size=5,
+        ),
+        anchored=st.booleans(),
+    )
+    def test_query_matches_every_walked_path(self, paths, pattern, anchored):
+        """query() returns exactly the walked Resources the pattern matches."""
+        tree = ResourceTree(root_name="root")
+        for segments in paths:
+            path = "/root/" + "/".join(segments)
+            if tree.get(path) is None:
+                tree.create(path)
+        if anchored:
+            pattern = ["root", *pattern]
+        pattern_str = "/" + "/".join(pattern)
+
+        expected = [r for r in tree.walk() if match_pattern(r.path, pattern_str)]
+
+        assert tree.query(pattern_str) == expected